@@ -0,0 +1,44 @@
+"""Composite listing index on video_variants and partial unfinished-jobs index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite index matching the listing query (WHERE video_id ... ORDER BY created_at DESC, id DESC)
+    op.create_index(
+        'ix_variants_video_created',
+        'video_variants',
+        ['video_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    op.drop_index('ix_video_variants_video_id', table_name='video_variants')
+
+    # Partial index covering only unfinished jobs; INCLUDE lets the
+    # status-polling hot path use index-only scans
+    op.create_index(
+        'ix_jobs_unfinished',
+        'jobs',
+        ['created_at'],
+        postgresql_where=sa.text("status IN ('PENDING', 'STARTED')"),
+        postgresql_include=['output_variant_id', 'progress'],
+    )
+    op.drop_index('ix_jobs_status_created_at', table_name='jobs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_jobs_status_created_at', 'jobs', ['status', 'created_at'])
+    op.drop_index('ix_jobs_unfinished', table_name='jobs')
+
+    op.create_index('ix_video_variants_video_id', 'video_variants', ['video_id'])
+    op.drop_index('ix_variants_video_created', table_name='video_variants')
@@ -0,0 +1,28 @@
+"""Listing index on videos(upload_time DESC, id DESC)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches the listing ORDER BY (both the offset and keyset paths)
+    op.create_index(
+        'ix_videos_upload_time',
+        'videos',
+        [sa.text('upload_time DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_upload_time', table_name='videos')
@@ -0,0 +1,46 @@
+"""Per-status partial indexes for job worker scans
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_pending / list_started each filter on one status and order by
+    # created_at; a partial index per status serves those scans exactly
+    op.create_index(
+        'ix_jobs_pending',
+        'jobs',
+        ['created_at'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+    op.create_index(
+        'ix_jobs_started',
+        'jobs',
+        ['created_at'],
+        postgresql_where=sa.text("status = 'STARTED'"),
+    )
+    # Superseded by the two per-status indexes above
+    op.drop_index('ix_jobs_unfinished', table_name='jobs')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'ix_jobs_unfinished',
+        'jobs',
+        ['created_at'],
+        postgresql_where=sa.text("status IN ('PENDING', 'STARTED')"),
+        postgresql_include=['output_variant_id', 'progress'],
+    )
+    op.drop_index('ix_jobs_started', table_name='jobs')
+    op.drop_index('ix_jobs_pending', table_name='jobs')
@@ -0,0 +1,93 @@
+"""Convert native Postgres enums to VARCHAR + CHECK
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# (table, column, enum type, varchar width, allowed values)
+_ENUM_COLUMNS = [
+    ('video_variants', 'kind', 'variantkind', 16,
+     ['trim', 'overlay', 'watermark', 'transcode']),
+    ('video_variants', 'quality', 'variantquality', 16,
+     ['source', '1080p', '720p', '480p']),
+    ('overlays', 'type', 'overlaytype', 16,
+     ['text', 'image', 'video', 'watermark']),
+    ('jobs', 'type', 'jobtype', 32,
+     ['upload_probe', 'trim', 'overlay', 'watermark', 'transcode_multi']),
+    ('jobs', 'status', 'jobstatus', 16,
+     ['PENDING', 'STARTED', 'SUCCESS', 'FAILURE']),
+]
+
+_CHECK_NAMES = {
+    ('video_variants', 'kind'): 'ck_variant_kind',
+    ('video_variants', 'quality'): 'ck_variant_quality',
+    ('overlays', 'type'): 'ck_overlay_type',
+    ('jobs', 'type'): 'ck_job_type',
+    ('jobs', 'status'): 'ck_job_status',
+}
+
+
+def upgrade() -> None:
+    # Native enums add per-query OID resolution overhead on some drivers
+    # and need ALTER TYPE for every new value; plain VARCHAR + CHECK
+    # keeps the same validation without either cost.
+
+    # The per-status partial indexes reference enum literals; rebuild
+    # them against the varchar column below
+    op.drop_index('ix_jobs_pending', table_name='jobs')
+    op.drop_index('ix_jobs_started', table_name='jobs')
+
+    for table, column, _, width, values in _ENUM_COLUMNS:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} '
+            f'TYPE varchar({width}) USING {column}::text'
+        )
+        value_list = ', '.join(f"'{value}'" for value in values)
+        op.create_check_constraint(
+            _CHECK_NAMES[(table, column)], table, f'{column} IN ({value_list})'
+        )
+
+    for _, _, enum_type, _, _ in _ENUM_COLUMNS:
+        op.execute(f'DROP TYPE IF EXISTS {enum_type}')
+
+    op.create_index(
+        'ix_jobs_pending', 'jobs', ['created_at'],
+        postgresql_where=sa.text("status = 'PENDING'")
+    )
+    op.create_index(
+        'ix_jobs_started', 'jobs', ['created_at'],
+        postgresql_where=sa.text("status = 'STARTED'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_pending', table_name='jobs')
+    op.drop_index('ix_jobs_started', table_name='jobs')
+
+    for table, column, enum_type, _, values in _ENUM_COLUMNS:
+        op.drop_constraint(_CHECK_NAMES[(table, column)], table, type_='check')
+        value_list = ', '.join(f"'{value}'" for value in values)
+        op.execute(f"CREATE TYPE {enum_type} AS ENUM ({value_list})")
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} '
+            f'TYPE {enum_type} USING {column}::{enum_type}'
+        )
+
+    op.create_index(
+        'ix_jobs_pending', 'jobs', ['created_at'],
+        postgresql_where=sa.text("status = 'PENDING'")
+    )
+    op.create_index(
+        'ix_jobs_started', 'jobs', ['created_at'],
+        postgresql_where=sa.text("status = 'STARTED'")
+    )
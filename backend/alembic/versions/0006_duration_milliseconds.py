@@ -0,0 +1,39 @@
+"""Store durations as integer milliseconds
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Numeric(10,3) decodes to Decimal on every read; a bigint column
+    # keeps durations as plain ints end to end
+    op.add_column('videos', sa.Column('duration_ms', sa.BigInteger(), nullable=True))
+    op.execute('UPDATE videos SET duration_ms = (duration_sec * 1000)::bigint')
+    op.drop_column('videos', 'duration_sec')
+
+    op.add_column('video_variants', sa.Column('duration_ms', sa.BigInteger(), nullable=True))
+    op.execute('UPDATE video_variants SET duration_ms = (duration_sec * 1000)::bigint')
+    op.alter_column('video_variants', 'duration_ms', nullable=False)
+    op.drop_column('video_variants', 'duration_sec')
+
+
+def downgrade() -> None:
+    op.add_column('video_variants', sa.Column('duration_sec', sa.Numeric(precision=10, scale=3), nullable=True))
+    op.execute('UPDATE video_variants SET duration_sec = duration_ms / 1000.0')
+    op.alter_column('video_variants', 'duration_sec', nullable=False)
+    op.drop_column('video_variants', 'duration_ms')
+
+    op.add_column('videos', sa.Column('duration_sec', sa.Numeric(precision=10, scale=3), nullable=True))
+    op.execute('UPDATE videos SET duration_sec = duration_ms / 1000.0')
+    op.drop_column('videos', 'duration_ms')
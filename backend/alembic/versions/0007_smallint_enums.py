@@ -0,0 +1,115 @@
+"""Store enum columns as SMALLINT codes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Codes follow enum definition order (see models.enum_code)
+_VARIANT_KIND = ['trim', 'overlay', 'watermark', 'transcode']
+_VARIANT_QUALITY = ['source', '1080p', '720p', '480p']
+_OVERLAY_TYPE = ['text', 'image', 'video', 'watermark']
+_JOB_TYPE = ['upload_probe', 'trim', 'overlay', 'watermark', 'transcode_multi']
+_JOB_STATUS = ['PENDING', 'STARTED', 'SUCCESS', 'FAILURE']
+
+
+def _to_code(column: str, values: list) -> str:
+    cases = ' '.join(f"WHEN '{value}' THEN {code}" for code, value in enumerate(values))
+    return f'CASE {column} {cases} END'
+
+
+def _to_string(column: str, values: list) -> str:
+    cases = ' '.join(f"WHEN {code} THEN '{value}'" for code, value in enumerate(values))
+    return f'CASE {column} {cases} END'
+
+
+def _alter(table: str, column: str, using: str, type_sql: str) -> None:
+    op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_sql} USING {using}')
+
+
+def upgrade() -> None:
+    # The per-status partial indexes reference string literals; rebuild
+    # them against the integer codes below
+    op.drop_index('ix_jobs_pending', table_name='jobs')
+    op.drop_index('ix_jobs_started', table_name='jobs')
+
+    op.drop_constraint('ck_variant_kind', 'video_variants', type_='check')
+    op.drop_constraint('ck_variant_quality', 'video_variants', type_='check')
+    op.drop_constraint('ck_overlay_type', 'overlays', type_='check')
+    op.drop_constraint('ck_job_type', 'jobs', type_='check')
+    op.drop_constraint('ck_job_status', 'jobs', type_='check')
+
+    _alter('video_variants', 'kind', _to_code('kind', _VARIANT_KIND), 'smallint')
+    _alter('video_variants', 'quality', _to_code('quality', _VARIANT_QUALITY), 'smallint')
+    _alter('overlays', 'type', _to_code('type', _OVERLAY_TYPE), 'smallint')
+    _alter('jobs', 'type', _to_code('type', _JOB_TYPE), 'smallint')
+    _alter('jobs', 'status', _to_code('status', _JOB_STATUS), 'smallint')
+
+    op.create_check_constraint('ck_variant_kind', 'video_variants', 'kind BETWEEN 0 AND 3')
+    op.create_check_constraint('ck_variant_quality', 'video_variants', 'quality BETWEEN 0 AND 3')
+    op.create_check_constraint('ck_overlay_type', 'overlays', 'type BETWEEN 0 AND 3')
+    op.create_check_constraint('ck_job_type', 'jobs', 'type BETWEEN 0 AND 4')
+    op.create_check_constraint('ck_job_status', 'jobs', 'status BETWEEN 0 AND 3')
+
+    op.create_index(
+        'ix_jobs_pending', 'jobs', ['created_at'], postgresql_where=sa.text('status = 0')
+    )
+    op.create_index(
+        'ix_jobs_started', 'jobs', ['created_at'], postgresql_where=sa.text('status = 1')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_pending', table_name='jobs')
+    op.drop_index('ix_jobs_started', table_name='jobs')
+
+    op.drop_constraint('ck_variant_kind', 'video_variants', type_='check')
+    op.drop_constraint('ck_variant_quality', 'video_variants', type_='check')
+    op.drop_constraint('ck_overlay_type', 'overlays', type_='check')
+    op.drop_constraint('ck_job_type', 'jobs', type_='check')
+    op.drop_constraint('ck_job_status', 'jobs', type_='check')
+
+    _alter('video_variants', 'kind', _to_string('kind', _VARIANT_KIND), 'varchar(16)')
+    _alter('video_variants', 'quality', _to_string('quality', _VARIANT_QUALITY), 'varchar(16)')
+    _alter('overlays', 'type', _to_string('type', _OVERLAY_TYPE), 'varchar(16)')
+    _alter('jobs', 'type', _to_string('type', _JOB_TYPE), 'varchar(32)')
+    _alter('jobs', 'status', _to_string('status', _JOB_STATUS), 'varchar(16)')
+
+    op.create_check_constraint(
+        'ck_variant_kind', 'video_variants',
+        "kind IN ('trim', 'overlay', 'watermark', 'transcode')"
+    )
+    op.create_check_constraint(
+        'ck_variant_quality', 'video_variants',
+        "quality IN ('source', '1080p', '720p', '480p')"
+    )
+    op.create_check_constraint(
+        'ck_overlay_type', 'overlays',
+        "type IN ('text', 'image', 'video', 'watermark')"
+    )
+    op.create_check_constraint(
+        'ck_job_type', 'jobs',
+        "type IN ('upload_probe', 'trim', 'overlay', 'watermark', 'transcode_multi')"
+    )
+    op.create_check_constraint(
+        'ck_job_status', 'jobs',
+        "status IN ('PENDING', 'STARTED', 'SUCCESS', 'FAILURE')"
+    )
+
+    op.create_index(
+        'ix_jobs_pending', 'jobs', ['created_at'],
+        postgresql_where=sa.text("status = 'PENDING'")
+    )
+    op.create_index(
+        'ix_jobs_started', 'jobs', ['created_at'],
+        postgresql_where=sa.text("status = 'STARTED'")
+    )
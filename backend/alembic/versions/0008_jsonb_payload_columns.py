@@ -0,0 +1,39 @@
+"""Convert JSON payload columns to JSONB
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-01-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # JSONB stores parsed binary (no re-parse on read) and supports GIN
+    # indexing on payload_json if it's ever queried by content
+    op.execute(
+        'ALTER TABLE video_variants ALTER COLUMN config_json TYPE jsonb '
+        'USING config_json::jsonb'
+    )
+    op.execute(
+        'ALTER TABLE overlays ALTER COLUMN payload_json TYPE jsonb '
+        'USING payload_json::jsonb'
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        'ALTER TABLE overlays ALTER COLUMN payload_json TYPE json '
+        'USING payload_json::json'
+    )
+    op.execute(
+        'ALTER TABLE video_variants ALTER COLUMN config_json TYPE json '
+        'USING config_json::json'
+    )
@@ -1,21 +1,33 @@
 """API dependencies for database and pagination."""
 
-from typing import Generator
-
 from fastapi import Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 
-from app.db.base import get_db
-from app.db.crud import VideoCRUD, VideoVariantCRUD, JobCRUD
+from app.db.base import get_async_db, get_db
+from app.db.crud import VideoCRUD, VideoVariantCRUD
 from app.db.models import Video, VideoVariant, Job
 
 
+class Pagination(BaseModel):
+    """Validated pagination parameters."""
+    model_config = ConfigDict(frozen=True)
+    page: int = Field(1, ge=1, description="Page number")
+    page_size: int = Field(20, ge=1, le=100, description="Items per page")
+
+
 def get_pagination(
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page")
-) -> tuple[int, int]:
-    """Get pagination parameters."""
-    return page, page_size
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+) -> Pagination:
+    """Get pagination parameters.
+
+    Query already enforced the bounds, so the frozen model is built
+    without a second validation pass.
+    """
+    return Pagination.model_construct(page=page, page_size=page_size)
 
 
 def get_video_by_id(video_id: str, db: Session = Depends(get_db)) -> Video:
@@ -34,9 +46,10 @@ def get_variant_by_id(variant_id: str, db: Session = Depends(get_db)) -> VideoVa
     return variant
 
 
-def get_job_by_id(job_id: str, db: Session = Depends(get_db)) -> Job:
-    """Get job by ID or raise 404."""
-    job = JobCRUD.get_by_id(db, job_id)
+async def get_job_by_id(job_id: str, db: AsyncSession = Depends(get_async_db)) -> Job:
+    """Get job by ID (with its output variant prefetched) or raise 404."""
+    stmt = select(Job).options(joinedload(Job.output_variant)).where(Job.id == job_id)
+    job = (await db.execute(stmt)).scalar_one_or_none()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
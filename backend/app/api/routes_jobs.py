@@ -1,29 +1,34 @@
 """Job status and result routes."""
 
 from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 
-from app.api.deps import get_db, get_job_by_id
-from app.db.crud import VideoVariantCRUD
+from app.api.deps import get_job_by_id
 from app.db.models import Job, JobStatus
 from app.db.schemas import JobStatusOut
 from app.services.storage import open_stream
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+# Prebuilt serializer for the poll endpoint; skips the per-request
+# jsonable_encoder walk
+_job_status_adapter = TypeAdapter(JobStatusOut)
+
 
 @router.get("/status/{job_id}", response_model=JobStatusOut, summary="Get job status")
 async def get_job_status(
     job: Job = Depends(get_job_by_id)
-) -> JobStatusOut:
+) -> ORJSONResponse:
     """Get the status and progress of a job."""
-    
-    return JobStatusOut(
+
+    status = JobStatusOut(
         job_id=job.id,
         status=job.status,
         progress=job.progress,
         error_message=job.error_message
     )
+    return ORJSONResponse(_job_status_adapter.dump_python(status, mode="json"))
 
 
 @router.get("/result/{job_id}", summary="Get job result")
@@ -47,8 +52,8 @@ async def get_job_result(
     if not job.output_variant_id:
         raise HTTPException(status_code=404, detail="No output variant found")
     
-    # Get output variant
-    variant = VideoVariantCRUD.get_by_id(job.db, job.output_variant_id)
+    # Output variant is eager-loaded alongside the job
+    variant = job.output_variant
     if not variant:
         raise HTTPException(status_code=404, detail="Output variant not found")
     
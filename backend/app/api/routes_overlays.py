@@ -1,17 +1,29 @@
 """Overlay processing routes."""
 
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.core.errors import SecurityError
-from app.db.crud import VideoCRUD, VideoVariantCRUD
-from app.db.schemas import JobIdOut, OverlaysIn, WatermarkIn
+from app.db.crud import JobCRUD, VideoVariantCRUD
+from app.db.schemas import JobIdOut, OverlaySpec, OverlaysIn, WatermarkIn
 from app.services.jobs import job_manager, JobType, handle_overlay
 from app.services.storage import validate_asset_path
 
 router = APIRouter(prefix="/overlays", tags=["overlays"])
 
+# Module-level adapter dumps the whole overlay list in one pydantic-core pass
+_overlays_adapter = TypeAdapter(List[OverlaySpec])
+
+# Typed dispatch for overlay kinds that reference filesystem assets
+_ASSET_GETTERS = {
+    "image": lambda o: o.image_path,
+    "video": lambda o: o.video_path,
+}
+
 
 @router.post("", response_model=JobIdOut, summary="Apply overlays and watermark")
 async def apply_overlays(
@@ -20,20 +32,18 @@ async def apply_overlays(
 ) -> JobIdOut:
     """Apply text, image, video overlays and watermark to video."""
     
-    # Get video or source variant
+    # The video-existence check happens inside the job INSERT itself; only
+    # the source-variant path needs an up-front lookup
     if request.source_variant_id:
         source_variant = VideoVariantCRUD.get_by_id(db, request.source_variant_id)
         if not source_variant:
             raise HTTPException(status_code=404, detail="Source variant not found")
-    else:
-        video = VideoCRUD.get_by_id(db, request.video_id)
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
-    
+
     # Validate asset paths
     for overlay in request.overlays:
-        if overlay.type in ["image", "video"]:
-            asset_path = getattr(overlay, "image_path", None) or getattr(overlay, "video_path", None)
+        getter = _ASSET_GETTERS.get(overlay.type)
+        if getter is not None:
+            asset_path = getter(overlay)
             if asset_path and not validate_asset_path(asset_path):
                 raise HTTPException(
                     status_code=400,
@@ -46,19 +56,19 @@ async def apply_overlays(
             detail=f"Invalid watermark path: {request.watermark.image_path}"
         )
     
-    # Submit overlay job
-    job_id = job_manager.submit(
-        JobType.OVERLAY,
-        {
-            "video_id": request.video_id,
-            "source_variant_id": request.source_variant_id,
-            "overlays": [overlay.model_dump() for overlay in request.overlays],
-            "watermark": request.watermark.model_dump() if request.watermark else None
-        },
-        handle_overlay,
-        db
-    )
-    
+    # Create and schedule the overlay job: INSERT ... SELECT WHERE EXISTS
+    # verifies the video and inserts the job row in one round-trip
+    payload = {
+        "video_id": request.video_id,
+        "source_variant_id": request.source_variant_id,
+        "overlays": _overlays_adapter.dump_python(request.overlays, warnings=False),
+        "watermark": request.watermark.model_dump(warnings=False) if request.watermark else None
+    }
+    job_id = JobCRUD.create_if_video_exists(db, request.video_id, JobType.OVERLAY)
+    if job_id is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    job_manager.submit_existing(job_id, JobType.OVERLAY, payload, handle_overlay)
+
     return JobIdOut(job_id=job_id)
 
 
@@ -69,31 +79,27 @@ async def apply_watermark(
 ) -> JobIdOut:
     """Apply an image watermark for the full duration of the video."""
 
-    # Validate video or variant
+    # Only the source-variant path needs an up-front lookup; the video
+    # check happens inside the job INSERT
     if request.source_variant_id:
         source_variant = VideoVariantCRUD.get_by_id(db, request.source_variant_id)
         if not source_variant:
             raise HTTPException(status_code=404, detail="Source variant not found")
-    else:
-        video = VideoCRUD.get_by_id(db, request.video_id)
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
 
     # Validate watermark asset path
     if not validate_asset_path(request.watermark.image_path):
         raise HTTPException(status_code=400, detail=f"Invalid watermark path: {request.watermark.image_path}")
 
-    # Submit job with no overlays and given watermark
-    job_id = job_manager.submit(
-        JobType.OVERLAY,
-        {
-            "video_id": request.video_id,
-            "source_variant_id": request.source_variant_id,
-            "overlays": [],
-            "watermark": request.watermark.model_dump()
-        },
-        handle_overlay,
-        db
-    )
+    # Create and schedule the job with no overlays and given watermark
+    payload = {
+        "video_id": request.video_id,
+        "source_variant_id": request.source_variant_id,
+        "overlays": [],
+        "watermark": request.watermark.model_dump(warnings=False)
+    }
+    job_id = JobCRUD.create_if_video_exists(db, request.video_id, JobType.OVERLAY)
+    if job_id is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    job_manager.submit_existing(job_id, JobType.OVERLAY, payload, handle_overlay)
 
     return JobIdOut(job_id=job_id)
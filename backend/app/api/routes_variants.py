@@ -1,19 +1,24 @@
 """Video variant management routes."""
 
-from typing import Annotated
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_pagination, get_video_by_id, get_variant_by_id
+from app.api.deps import Pagination, get_db, get_pagination, get_video_by_id, get_variant_by_id
 from app.db.crud import VideoVariantCRUD
 from app.db.models import Video, VideoVariant
 from app.db.schemas import JobIdOut, TranscodeIn, VariantListResponse, VideoVariantOut
 from app.services.jobs import job_manager, JobType, handle_transcode_multi
 from app.services.storage import open_stream
+from app.utils.cursors import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/variants", tags=["variants"])
 
+# Module-level adapter validates whole result pages in one C-level pass
+_variants_adapter = TypeAdapter(List[VideoVariantOut])
+
 
 @router.post("/transcode/{video_id}", response_model=JobIdOut, summary="Transcode video to multiple qualities")
 async def transcode_video(
@@ -42,29 +47,55 @@ async def transcode_video(
 async def list_video_variants(
     video_id: str,
     video: Video = Depends(get_video_by_id),
-    pagination: Annotated[tuple[int, int], Depends(get_pagination)] = (1, 20),
+    pagination: Annotated[Pagination, Depends(get_pagination)] = Pagination(),
+    cursor: Optional[str] = Query(None, description="Opaque cursor for keyset pagination"),
     db: Session = Depends(get_db)
 ) -> VariantListResponse:
-    """Get all variants for a video."""
-    
-    page, page_size = pagination
-    variants = VideoVariantCRUD.list_by_video(db, video_id)
-    
-    # Simple pagination for variants
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_variants = variants[start_idx:end_idx]
-    
-    has_next = end_idx < len(variants)
+    """Get all variants for a video.
+
+    Prefers keyset pagination via `cursor`; falls back to page/offset
+    pagination (with a total count) when no cursor is supplied.
+    """
+
+    page, page_size = pagination.page, pagination.page_size
+
+    if cursor is not None:
+        try:
+            cursor_key = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        variants, has_next = VideoVariantCRUD.list_by_video_after_cursor(
+            db, video_id, cursor_key, page_size
+        )
+        next_cursor = encode_cursor(variants[-1].created_at, variants[-1].id) if has_next else None
+
+        # Items are already validated by the adapter; skip re-validating
+        # the wrapper
+        return VariantListResponse.model_construct(
+            items=_variants_adapter.validate_python(variants, from_attributes=True),
+            total=None,
+            page=page,
+            page_size=page_size,
+            has_next=has_next,
+            has_prev=True,
+            next_cursor=next_cursor
+        )
+
+    variants, total = VideoVariantCRUD.list_by_video_paginated(db, video_id, page, page_size)
+
+    has_next = (page * page_size) < total
     has_prev = page > 1
-    
-    return VariantListResponse(
-        items=[VideoVariantOut.model_validate(variant) for variant in paginated_variants],
-        total=len(variants),
+    next_cursor = encode_cursor(variants[-1].created_at, variants[-1].id) if has_next and variants else None
+
+    return VariantListResponse.model_construct(
+        items=_variants_adapter.validate_python(variants, from_attributes=True),
+        total=total,
         page=page,
         page_size=page_size,
         has_next=has_next,
-        has_prev=has_prev
+        has_prev=has_prev,
+        next_cursor=next_cursor
     )
 
 
@@ -1,21 +1,27 @@
 """Video upload and listing routes."""
 
-from typing import Annotated
+import asyncio
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_pagination
+from app.api.deps import Pagination, get_db, get_pagination
 from app.core.errors import ValidationError
 from app.db.crud import VideoCRUD
 from app.db.schemas import VideoListResponse, VideoOut
 from app.services.ffmpeg import probe
 from app.services.jobs import job_manager, JobType
 from app.services.storage import save_upload
+from app.utils.cursors import decode_cursor, encode_cursor
 from app.utils.ids import is_video_file
 
 router = APIRouter(prefix="/videos", tags=["videos"])
 
+# Module-level adapter validates whole result pages in one C-level pass
+_videos_adapter = TypeAdapter(List[VideoOut])
+
 
 @router.post("/upload", response_model=VideoOut, summary="Upload video file")
 async def upload_video(
@@ -32,11 +38,11 @@ async def upload_video(
         raise HTTPException(status_code=400, detail="Unsupported video format")
     
     try:
-        # Save uploaded file
-        stored_file = save_upload(file)
-        
-        # Probe video metadata
-        video_info = probe(stored_file.path)
+        # Save and probe off the event loop: the disk copy and the
+        # ffprobe run can take seconds for large files, and blocking
+        # here would stall every other request
+        stored_file = await asyncio.to_thread(save_upload, file)
+        video_info = await asyncio.to_thread(probe, stored_file.path)
         
         # Create video record
         video = VideoCRUD.create(
@@ -58,22 +64,51 @@ async def upload_video(
 
 @router.get("", response_model=VideoListResponse, summary="List videos")
 async def list_videos(
-    pagination: Annotated[tuple[int, int], Depends(get_pagination)],
+    pagination: Annotated[Pagination, Depends(get_pagination)],
+    cursor: Optional[str] = Query(None, description="Opaque cursor for keyset pagination"),
+    exact_count: bool = Query(False, description="Force an exact total count"),
     db: Session = Depends(get_db)
 ) -> VideoListResponse:
-    """Get paginated list of uploaded videos."""
-    
-    page, page_size = pagination
-    videos, total = VideoCRUD.list_paginated(db, page, page_size)
-    
-    has_next = (page * page_size) < total
+    """Get paginated list of uploaded videos.
+
+    Prefers keyset pagination via `cursor`; falls back to page/offset
+    pagination (with a total count) when no cursor is supplied.
+    """
+
+    page, page_size = pagination.page, pagination.page_size
+
+    if cursor is not None:
+        try:
+            cursor_key = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        videos, has_next = VideoCRUD.list_after_cursor(db, cursor_key, page_size)
+        next_cursor = encode_cursor(videos[-1].upload_time, videos[-1].id) if has_next else None
+
+        # Items are already validated by the adapter; skip re-validating
+        # the wrapper
+        return VideoListResponse.model_construct(
+            items=_videos_adapter.validate_python(videos, from_attributes=True),
+            total=None,
+            page=page,
+            page_size=page_size,
+            has_next=has_next,
+            has_prev=True,
+            next_cursor=next_cursor
+        )
+
+    videos, total, has_next = VideoCRUD.list_paginated(db, page, page_size, exact_count=exact_count)
+
     has_prev = page > 1
-    
-    return VideoListResponse(
-        items=[VideoOut.model_validate(video) for video in videos],
+    next_cursor = encode_cursor(videos[-1].upload_time, videos[-1].id) if has_next and videos else None
+
+    return VideoListResponse.model_construct(
+        items=_videos_adapter.validate_python(videos, from_attributes=True),
         total=total,
         page=page,
         page_size=page_size,
         has_next=has_next,
-        has_prev=has_prev
+        has_prev=has_prev,
+        next_cursor=next_cursor
     )
@@ -1,6 +1,7 @@
 """Configuration management for the video processing backend."""
 
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Literal
 
@@ -22,6 +23,9 @@ class Settings(BaseSettings):
     db_name: str = Field(default="videos", alias="DB_NAME")
     db_user: str = Field(default="videos", alias="DB_USER")
     db_password: str = Field(default="videos", alias="DB_PASSWORD")
+    db_pool_size: int = Field(default=20, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=5.0, alias="DB_POOL_TIMEOUT")
     
     # Media configuration
     media_root: Path = Field(default=Path("/data"), alias="MEDIA_ROOT")
@@ -30,31 +34,40 @@ class Settings(BaseSettings):
     # FFmpeg configuration
     ffmpeg_bin: str = Field(default="ffmpeg", alias="FFMPEG_BIN")
     ffprobe_bin: str = Field(default="ffprobe", alias="FFPROBE_BIN")
+    # "auto" probes ffmpeg -encoders for a hardware H.264 encoder
+    video_encoder: Literal["auto", "libx264", "h264_nvenc", "h264_videotoolbox"] = Field(
+        default="auto", alias="VIDEO_ENCODER"
+    )
     
     # API configuration
     api_root_path: str = Field(default="", alias="API_ROOT_PATH")
     
-    @property
+    @cached_property
     def database_url(self) -> str:
         """Construct the database URL."""
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
+    @cached_property
+    def async_database_url(self) -> str:
+        """Construct the asyncpg database URL."""
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
-    @property
+    @cached_property
     def uploads_dir(self) -> Path:
         """Get the uploads directory path."""
         return self.media_root / "uploads"
     
-    @property
+    @cached_property
     def processed_dir(self) -> Path:
         """Get the processed directory path."""
         return self.media_root / "processed"
     
-    @property
+    @cached_property
     def variants_dir(self) -> Path:
         """Get the variants directory path."""
         return self.media_root / "variants"
     
-    @property
+    @cached_property
     def assets_dir(self) -> Path:
         """Get the assets directory path."""
         return Path("/app/assets")
@@ -1,22 +1,62 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Optional
+
+import orjson
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 from app.core.config import settings
 from app.db.models import Base
 
 
-# Create database engine
+def _json_serializer(value) -> str:
+    """orjson-backed serializer for JSONB columns (~3x stdlib json)."""
+    return orjson.dumps(value).decode()
+
+
+# Create database engine (module-global so all requests share one pool)
 engine = create_engine(
     settings.database_url,
     echo=settings.app_env == "dev",
     pool_pre_ping=True,
-    pool_recycle=300,
+    pool_recycle=1800,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
+
+# Create session factory; expire_on_commit=False keeps already-loaded
+# attributes usable after commit without a re-SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+# Thread-scoped registry for job executor threads only: each long-lived
+# worker thread keeps one warm session across jobs instead of paying
+# session setup/teardown per job. Request handling must NOT use a
+# thread-local registry — FastAPI runs a sync dependency's setup and
+# teardown on arbitrary (and possibly different) threadpool threads.
+WorkerSession = scoped_session(SessionLocal)
+
+
+# Async engine for high-QPS endpoints (job polling) so they never leave
+# the event loop for a threadpool hop
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    connect_args={"statement_cache_size": 1024},
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
 
 
 def get_db():
@@ -28,8 +68,36 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def warmup_pool():
+    """Pre-open pool connections so early requests skip handshake latency."""
+    connections = [engine.connect() for _ in range(settings.db_pool_size)]
+    for connection in connections:
+        connection.close()
+
+
+def _alembic_version() -> Optional[str]:
+    """Return the Alembic version stamp, or None when absent."""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except Exception:
+        return None
+
+
 def create_tables():
-    """Create all database tables."""
+    """Create all database tables unless Alembic already manages the schema.
+
+    When a version stamp exists, one SELECT replaces the per-table
+    catalog reflection create_all would repeat on every boot.
+    """
+    if _alembic_version() is not None:
+        return
     Base.metadata.create_all(bind=engine)
 
 
@@ -1,12 +1,33 @@
 """Database CRUD operations."""
 
+import csv
+import io
+import time
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import desc, func
-from sqlalchemy.orm import Session
+import orjson
+from sqlalchemy import desc, exists, func, insert, lambda_stmt, literal, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import Session, selectinload
 
-from app.db.models import Job, JobStatus, JobType, Overlay, Video, VideoVariant, VariantKind
+from app.db.models import (
+    Job,
+    JobStatus,
+    JobType,
+    Overlay,
+    Video,
+    VideoVariant,
+    VariantKind,
+    VariantQuality,
+    enum_code,
+)
+from app.utils.ids import uuid7
+
+# In-process cache for planner row estimates: table name -> (expiry, count)
+_APPROX_COUNT_TTL = 30.0
+_approx_counts: dict[str, tuple[float, int]] = {}
 
 
 class VideoCRUD:
@@ -26,7 +47,7 @@ class VideoCRUD:
             original_filename=original_filename,
             stored_path=stored_path,
             size_bytes=size_bytes,
-            duration_sec=duration_sec,
+            duration_ms=round(duration_sec * 1000) if duration_sec is not None else None,
             mime_type=mime_type,
         )
         db.add(video)
@@ -37,15 +58,81 @@ class VideoCRUD:
     @staticmethod
     def get_by_id(db: Session, video_id: UUID) -> Optional[Video]:
         """Get video by ID."""
-        return db.query(Video).filter(Video.id == video_id).first()
+        stmt = lambda_stmt(lambda: select(Video).where(Video.id == video_id))
+        return db.execute(stmt).scalar_one_or_none()
     
     @staticmethod
-    def list_paginated(db: Session, page: int = 1, page_size: int = 20) -> tuple[List[Video], int]:
-        """Get paginated list of videos."""
+    def approx_count(db: Session) -> int:
+        """Get the planner's row estimate for videos, cached for a short TTL.
+
+        Returns -1 when no estimate is available yet (table never
+        analyzed); callers should fall back to an exact count.
+        """
+        now = time.monotonic()
+        cached = _approx_counts.get("videos")
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'videos'")
+        ).scalar()
+        estimate = int(estimate) if estimate is not None else -1
+        if estimate >= 0:
+            _approx_counts["videos"] = (now + _APPROX_COUNT_TTL, estimate)
+        return estimate
+
+    @staticmethod
+    def list_paginated(
+        db: Session, page: int = 1, page_size: int = 20, exact_count: bool = False
+    ) -> tuple[List[Video], int, bool]:
+        """Get paginated list of videos, plus whether a next page exists."""
         offset = (page - 1) * page_size
-        videos = db.query(Video).order_by(desc(Video.upload_time)).offset(offset).limit(page_size).all()
-        total = db.query(Video).count()
-        return videos, total
+
+        if exact_count:
+            # count(*) OVER () returns the exact total alongside the page
+            # in a single query instead of a separate COUNT round-trip
+            rows = (
+                db.query(Video, func.count().over().label("total"))
+                .order_by(desc(Video.upload_time))
+                .offset(offset)
+                .limit(page_size)
+                .all()
+            )
+            if rows:
+                total = rows[0][1]
+                return [row[0] for row in rows], total, (page * page_size) < total
+            return [], db.query(Video).count(), False
+
+        # Over-fetch one row so has_next comes from the data itself; the
+        # planner estimate is only good enough for the advisory total
+        rows = (
+            db.query(Video)
+            .order_by(desc(Video.upload_time))
+            .offset(offset)
+            .limit(page_size + 1)
+            .all()
+        )
+        has_next = len(rows) > page_size
+        total = VideoCRUD.approx_count(db)
+        if total < 0:
+            total = db.query(Video).count()
+        return rows[:page_size], total, has_next
+
+    @staticmethod
+    def list_after_cursor(
+        db: Session, cursor: Optional[tuple[datetime, UUID]], page_size: int = 20
+    ) -> tuple[List[Video], bool]:
+        """Get videos after a (upload_time, id) cursor using keyset pagination."""
+        query = db.query(Video)
+        if cursor is not None:
+            query = query.filter(tuple_(Video.upload_time, Video.id) < cursor)
+        rows = (
+            query.order_by(desc(Video.upload_time), desc(Video.id))
+            .limit(page_size + 1)
+            .all()
+        )
+        has_next = len(rows) > page_size
+        return rows[:page_size], has_next
 
 
 class VideoVariantCRUD:
@@ -71,23 +158,106 @@ class VideoVariantCRUD:
             source_variant_id=source_variant_id,
             stored_path=stored_path,
             size_bytes=size_bytes,
-            duration_sec=duration_sec,
+            duration_ms=round(duration_sec * 1000),
             config_json=config_json,
         )
         db.add(variant)
         db.commit()
-        db.refresh(variant)
         return variant
+
+    @staticmethod
+    def _ms_fields(fields: dict) -> dict:
+        """Convert a duration_sec field to the stored duration_ms."""
+        if "duration_sec" in fields:
+            fields = dict(fields)
+            fields["duration_ms"] = round(float(fields.pop("duration_sec")) * 1000)
+        return fields
+
+    @staticmethod
+    def copy_insert(db: Session, rows: List[dict]) -> List[UUID]:
+        """Bulk-insert variant rows with COPY, bypassing the ORM entirely.
+
+        Ids are generated client-side since COPY has no RETURNING; the
+        generated ids are returned in row order.
+        """
+        ids: List[UUID] = []
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for fields in rows:
+            fields = VideoVariantCRUD._ms_fields(fields)
+            row_id = fields.get("id") or uuid7()
+            ids.append(row_id)
+            kind = fields["kind"]
+            if not isinstance(kind, VariantKind):
+                kind = VariantKind(kind)
+            quality = fields.get("quality")
+            if quality is not None and not isinstance(quality, VariantQuality):
+                quality = VariantQuality(quality)
+            config_json = fields.get("config_json")
+            writer.writerow([
+                str(row_id),
+                str(fields["video_id"]),
+                enum_code(kind),
+                enum_code(quality) if quality is not None else "",
+                fields["stored_path"],
+                fields["size_bytes"],
+                fields["duration_ms"],
+                orjson.dumps(config_json).decode() if config_json is not None else "",
+            ])
+        buffer.seek(0)
+
+        cursor = db.connection().connection.cursor()
+        cursor.copy_expert(
+            "COPY video_variants (id, video_id, kind, quality, stored_path, "
+            "size_bytes, duration_ms, config_json) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+        db.commit()
+        return ids
     
     @staticmethod
     def get_by_id(db: Session, variant_id: UUID) -> Optional[VideoVariant]:
         """Get variant by ID."""
-        return db.query(VideoVariant).filter(VideoVariant.id == variant_id).first()
+        stmt = lambda_stmt(lambda: select(VideoVariant).where(VideoVariant.id == variant_id))
+        return db.execute(stmt).scalar_one_or_none()
     
     @staticmethod
-    def list_by_video(db: Session, video_id: UUID) -> List[VideoVariant]:
-        """Get all variants for a video."""
-        return db.query(VideoVariant).filter(VideoVariant.video_id == video_id).all()
+    def list_by_video_paginated(
+        db: Session, video_id: UUID, page: int = 1, page_size: int = 20
+    ) -> tuple[List[VideoVariant], int]:
+        """Get paginated variants for a video with source variants eager-loaded."""
+        offset = (page - 1) * page_size
+        base_query = db.query(VideoVariant).filter(VideoVariant.video_id == video_id)
+        variants = (
+            base_query
+            .options(selectinload(VideoVariant.source_variant))
+            .order_by(desc(VideoVariant.created_at), desc(VideoVariant.id))
+            .offset(offset)
+            .limit(page_size)
+            .all()
+        )
+        total = base_query.count()
+        return variants, total
+
+    @staticmethod
+    def list_by_video_after_cursor(
+        db: Session,
+        video_id: UUID,
+        cursor: Optional[tuple[datetime, UUID]],
+        page_size: int = 20,
+    ) -> tuple[List[VideoVariant], bool]:
+        """Get variants for a video after a (created_at, id) cursor using keyset pagination."""
+        query = db.query(VideoVariant).filter(VideoVariant.video_id == video_id)
+        if cursor is not None:
+            query = query.filter(tuple_(VideoVariant.created_at, VideoVariant.id) < cursor)
+        rows = (
+            query.options(selectinload(VideoVariant.source_variant))
+            .order_by(desc(VideoVariant.created_at), desc(VideoVariant.id))
+            .limit(page_size + 1)
+            .all()
+        )
+        has_next = len(rows) > page_size
+        return rows[:page_size], has_next
 
 
 class JobCRUD:
@@ -108,14 +278,41 @@ class JobCRUD:
             status=JobStatus.PENDING,
         )
         db.add(job)
+        db.flush()
+        # Wake any LISTENing workers instead of making them poll
+        db.execute(text("NOTIFY jobs_pending"))
         db.commit()
-        db.refresh(job)
         return job
     
+    @staticmethod
+    def create_if_video_exists(db: Session, video_id: UUID, job_type: JobType) -> Optional[UUID]:
+        """Atomically create a job if its video exists, in a single round-trip.
+
+        Returns the new job id, or None when the video does not exist.
+        """
+        source = select(
+            literal(uuid7(), PostgresUUID(as_uuid=True)),
+            literal(video_id),
+            literal(enum_code(job_type)),
+            literal(enum_code(JobStatus.PENDING)),
+            literal(0),
+        ).where(exists(select(Video.id).where(Video.id == video_id)))
+        stmt = (
+            insert(Job)
+            .from_select(["id", "video_id", "type", "status", "progress"], source)
+            .returning(Job.id)
+        )
+        job_id = db.execute(stmt).scalar_one_or_none()
+        if job_id is not None:
+            db.execute(text("NOTIFY jobs_pending"))
+        db.commit()
+        return job_id
+
     @staticmethod
     def get_by_id(db: Session, job_id: UUID) -> Optional[Job]:
         """Get job by ID."""
-        return db.query(Job).filter(Job.id == job_id).first()
+        stmt = lambda_stmt(lambda: select(Job).where(Job.id == job_id))
+        return db.execute(stmt).scalar_one_or_none()
     
     @staticmethod
     def update_status(
@@ -125,33 +322,70 @@ class JobCRUD:
         progress: Optional[int] = None,
         error_message: Optional[str] = None,
         output_variant_id: Optional[UUID] = None,
-    ) -> Optional[Job]:
-        """Update job status and progress."""
-        job = db.query(Job).filter(Job.id == job_id).first()
-        if not job:
-            return None
-        
-        job.status = status
+    ) -> bool:
+        """Update job status and progress in a single UPDATE statement.
+
+        Returns whether a job row was updated.
+        """
+        values: dict = {"status": status}
         if progress is not None:
-            job.progress = progress
+            values["progress"] = progress
         if error_message is not None:
-            job.error_message = error_message
+            values["error_message"] = error_message
         if output_variant_id is not None:
-            job.output_variant_id = output_variant_id
-        
+            values["output_variant_id"] = output_variant_id
+
+        result = db.execute(update(Job).where(Job.id == job_id).values(**values))
         db.commit()
-        db.refresh(job)
-        return job
+        return result.rowcount > 0
     
+    @staticmethod
+    def update_progress(db: Session, job_id: UUID, progress: int) -> None:
+        """Persist a progress ping without touching any other column.
+
+        The progress guard keeps late-arriving pings from moving the bar
+        backwards; 0 is an explicit reset and always applies.
+        """
+        stmt = update(Job).where(Job.id == job_id).values(progress=progress)
+        if progress > 0:
+            stmt = stmt.where(Job.progress < progress)
+        db.execute(stmt)
+        db.commit()
+
+    @staticmethod
+    def claim_next(db: Session) -> Optional[Job]:
+        """Atomically claim the oldest pending job with SKIP LOCKED.
+
+        Concurrent workers each get a distinct job in one round-trip
+        instead of racing list_pending + update_status for the same row.
+        Returns None when no pending job is available.
+        """
+        # 0 = PENDING, 1 = STARTED; see models.enum_code
+        row = db.execute(text(
+            "UPDATE jobs SET status = 1 "
+            "WHERE id = ("
+            "    SELECT id FROM jobs "
+            "    WHERE status = 0 "
+            "    ORDER BY created_at "
+            "    FOR UPDATE SKIP LOCKED "
+            "    LIMIT 1"
+            ") "
+            "RETURNING id"
+        )).first()
+        db.commit()
+        if row is None:
+            return None
+        return JobCRUD.get_by_id(db, row[0])
+
     @staticmethod
     def list_pending(db: Session) -> List[Job]:
-        """Get all pending jobs."""
-        return db.query(Job).filter(Job.status == JobStatus.PENDING).all()
-    
+        """Get all pending jobs, oldest first."""
+        return db.query(Job).filter(Job.status == JobStatus.PENDING).order_by(Job.created_at).all()
+
     @staticmethod
     def list_started(db: Session) -> List[Job]:
-        """Get all started jobs."""
-        return db.query(Job).filter(Job.status == JobStatus.STARTED).all()
+        """Get all started jobs, oldest first."""
+        return db.query(Job).filter(Job.status == JobStatus.STARTED).order_by(Job.created_at).all()
 
 
 class OverlayCRUD:
@@ -174,5 +408,29 @@ class OverlayCRUD:
         )
         db.add(overlay)
         db.commit()
-        db.refresh(overlay)
         return overlay
+
+    @staticmethod
+    def create_many(
+        db: Session,
+        video_id: UUID,
+        variant_id: Optional[UUID],
+        overlay_specs: List[dict],
+    ) -> None:
+        """Insert one row per overlay spec in a single batched INSERT."""
+        if not overlay_specs:
+            return
+        db.bulk_insert_mappings(
+            Overlay,
+            [
+                {
+                    "id": uuid7(),
+                    "video_id": video_id,
+                    "variant_id": variant_id,
+                    "type": spec["type"],
+                    "payload_json": spec,
+                }
+                for spec in overlay_specs
+            ],
+        )
+        db.commit()
@@ -2,31 +2,81 @@
 
 import enum
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
     DateTime,
-    Enum,
     ForeignKey,
+    Index,
     Integer,
-    JSON,
-    Numeric,
+    SmallInteger,
     String,
     Text,
+    TypeDecorator,
     UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PostgresUUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
+from app.utils.ids import uuid7
+
 Base = declarative_base()
 
 
+@lru_cache(maxsize=None)
+def _enum_codes(enum_cls: type) -> dict:
+    return {member.name: code for code, member in enumerate(enum_cls)}
+
+
+def enum_code(member: enum.Enum) -> int:
+    """SMALLINT code stored for an enum member.
+
+    Codes follow definition order, which is therefore part of the
+    storage contract: new members must be appended, never reordered.
+    The cache is keyed by the member's class, not the member: str-mixin
+    members of different enums with equal values compare and hash equal,
+    so a per-member cache would let one enum's codes poison another's.
+    """
+    return _enum_codes(type(member))[member.name]
+
+
+class SmallIntEnum(TypeDecorator):
+    """Store a Python Enum as SMALLINT.
+
+    String enum values cost 5-15 bytes per row and compare as strings in
+    every status filter; a smallint halves index entries and keeps the
+    Python API unchanged (columns still read back as enum members).
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._members = list(enum_cls)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_cls):
+            value = self.enum_cls(value)
+        return enum_code(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
+
+
 class VariantKind(str, enum.Enum):
     """Video variant types."""
     TRIM = "trim"
@@ -73,11 +123,14 @@ class Video(Base):
     
     __tablename__ = "videos"
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
+    # uuid7 keeps inserts append-only in the PK index; server default
+    # remains for rows created outside the ORM
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=func.gen_random_uuid())
     original_filename = Column(Text, nullable=False)
     stored_path = Column(Text, nullable=False)
     size_bytes = Column(BigInteger, nullable=False)
-    duration_sec = Column(Numeric(10, 3), nullable=True)
+    # Integer milliseconds; Numeric would decode to Decimal on every read
+    duration_ms = Column(BigInteger, nullable=True)
     mime_type = Column(Text, nullable=False)
     upload_time = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
@@ -86,38 +139,32 @@ class Video(Base):
     overlays = relationship("Overlay", back_populates="video", cascade="all, delete-orphan")
     jobs = relationship("Job", back_populates="video", cascade="all, delete-orphan")
 
+    @property
+    def duration_sec(self) -> Optional[float]:
+        """Seconds view of duration_ms, kept for API compatibility."""
+        return self.duration_ms / 1000.0 if self.duration_ms is not None else None
+
 
 class VideoVariant(Base):
     """Processed video variants."""
     
     __tablename__ = "video_variants"
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
+    # uuid7 keeps inserts append-only in the PK index; server default
+    # remains for rows created outside the ORM
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=func.gen_random_uuid())
     video_id = Column(PostgresUUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
-    kind = Column(
-        Enum(
-            VariantKind,
-            name="variantkind",
-            values_callable=lambda enum_cls: [member.value for member in enum_cls],
-            create_type=False,
-        ),
-        nullable=False,
-    )
-    quality = Column(
-        Enum(
-            VariantQuality,
-            name="variantquality",
-            values_callable=lambda enum_cls: [member.value for member in enum_cls],
-            create_type=False,
-        ),
-        nullable=True,
-    )
+    kind = Column(SmallIntEnum(VariantKind), nullable=False)
+    quality = Column(SmallIntEnum(VariantQuality), nullable=True)
     source_variant_id = Column(PostgresUUID(as_uuid=True), ForeignKey("video_variants.id"), nullable=True)
     stored_path = Column(Text, nullable=False)
     size_bytes = Column(BigInteger, nullable=False)
-    duration_sec = Column(Numeric(10, 3), nullable=False)
+    # Integer milliseconds; Numeric would decode to Decimal on every read
+    duration_ms = Column(BigInteger, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    config_json = Column(JSON, nullable=True)
+    # JSONB: binary storage, GIN-indexable; (de)serialized with orjson
+    # via the engine's json_serializer/json_deserializer
+    config_json = Column(JSONB, nullable=True)
     
     # Relationships
     video = relationship("Video", back_populates="variants")
@@ -126,25 +173,24 @@ class VideoVariant(Base):
     input_jobs = relationship("Job", foreign_keys="Job.input_variant_id", back_populates="input_variant")
     output_jobs = relationship("Job", foreign_keys="Job.output_variant_id", back_populates="output_variant")
 
+    @property
+    def duration_sec(self) -> float:
+        """Seconds view of duration_ms, kept for API compatibility."""
+        return self.duration_ms / 1000.0
+
 
 class Overlay(Base):
     """Overlay specifications."""
     
     __tablename__ = "overlays"
     
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
+    # uuid7 keeps inserts append-only in the PK index; server default
+    # remains for rows created outside the ORM
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=func.gen_random_uuid())
     video_id = Column(PostgresUUID(as_uuid=True), ForeignKey("videos.id"), nullable=False)
     variant_id = Column(PostgresUUID(as_uuid=True), ForeignKey("video_variants.id"), nullable=True)
-    type = Column(
-        Enum(
-            OverlayType,
-            name="overlaytype",
-            values_callable=lambda enum_cls: [member.value for member in enum_cls],
-            create_type=False,
-        ),
-        nullable=False,
-    )
-    payload_json = Column(JSON, nullable=False)
+    type = Column(SmallIntEnum(OverlayType), nullable=False)
+    payload_json = Column(JSONB, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
@@ -156,22 +202,21 @@ class Job(Base):
     """Background job tracking."""
     
     __tablename__ = "jobs"
-    
-    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid4)
+    # Partial indexes so worker polling only touches unfinished rows
+    # (0 = PENDING, 1 = STARTED; see enum_code)
+    __table_args__ = (
+        Index("ix_jobs_pending", "created_at", postgresql_where=text("status = 0")),
+        Index("ix_jobs_started", "created_at", postgresql_where=text("status = 1")),
+    )
+
+    # uuid7 keeps inserts append-only in the PK index; server default
+    # remains for rows created outside the ORM
+    id = Column(PostgresUUID(as_uuid=True), primary_key=True, default=uuid7, server_default=func.gen_random_uuid())
     video_id = Column(PostgresUUID(as_uuid=True), ForeignKey("videos.id"), nullable=True)
     input_variant_id = Column(PostgresUUID(as_uuid=True), ForeignKey("video_variants.id"), nullable=True)
     output_variant_id = Column(PostgresUUID(as_uuid=True), ForeignKey("video_variants.id"), nullable=True)
-    # Persist enum VALUE strings (e.g., "trim"), not the Python Enum NAMES (e.g., "TRIM")
-    type = Column(
-        Enum(
-            JobType,
-            name="jobtype",
-            values_callable=lambda enum_cls: [member.value for member in enum_cls],
-            create_type=False,
-        ),
-        nullable=False,
-    )
-    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    type = Column(SmallIntEnum(JobType), nullable=False)
+    status = Column(SmallIntEnum(JobStatus), nullable=False, default=JobStatus.PENDING)
     progress = Column(Integer, nullable=False, default=0)
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,7 +1,7 @@
 """Pydantic schemas for API request/response models."""
 
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, Field, ConfigDict
@@ -9,7 +9,7 @@ from pydantic import BaseModel, Field, ConfigDict
 
 class VideoOut(BaseModel):
     """Video metadata response."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=False, frozen=True)
     id: UUID
     original_filename: str
     stored_path: str
@@ -21,7 +21,7 @@ class VideoOut(BaseModel):
 
 class VideoVariantOut(BaseModel):
     """Video variant response."""
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, defer_build=False, frozen=True)
     id: UUID
     kind: Literal["trim", "overlay", "watermark", "transcode"]
     quality: Optional[Literal["source", "1080p", "720p", "480p"]] = None
@@ -76,6 +76,11 @@ class OverlayVideo(BaseModel):
     scale: Optional[float] = 1.0
 
 
+# Discriminated on "type" so validation picks the right model in one
+# tag lookup instead of trying each union branch
+OverlaySpec = Annotated[Union[OverlayText, OverlayImage, OverlayVideo], Field(discriminator="type")]
+
+
 class Watermark(BaseModel):
     """Watermark specification."""
     image_path: str
@@ -88,7 +93,7 @@ class OverlaysIn(BaseModel):
     """Overlay processing request."""
     video_id: UUID
     source_variant_id: Optional[UUID] = None
-    overlays: List[Union[OverlayText, OverlayImage, OverlayVideo]] = Field(default_factory=list)
+    overlays: List[OverlaySpec] = Field(default_factory=list)
     watermark: Optional[Watermark] = None
 
 
@@ -111,6 +116,7 @@ class JobIdOut(BaseModel):
 
 class JobStatusOut(BaseModel):
     """Job status response."""
+    model_config = ConfigDict(defer_build=False)
     job_id: UUID
     status: Literal["PENDING", "STARTED", "SUCCESS", "FAILURE"]
     progress: int
@@ -119,12 +125,15 @@ class JobStatusOut(BaseModel):
 
 class PaginatedResponse(BaseModel):
     """Paginated response wrapper."""
+    # Build core schemas at import so the first request doesn't pay for it
+    model_config = ConfigDict(defer_build=False)
     items: List[Any]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 
 class VideoListResponse(PaginatedResponse):
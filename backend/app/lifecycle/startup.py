@@ -1,10 +1,11 @@
 """Application startup and shutdown lifecycle management."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.db.base import create_tables
+from app.db.base import create_tables, warmup_pool
 from app.services.jobs import job_manager
 from app.services.storage import ensure_directories
 
@@ -12,11 +13,15 @@ from app.services.storage import ensure_directories
 @asynccontextmanager
 async def lifespan(app):
     """Manage application lifecycle."""
-    # Startup
+    # Startup: logging first, then the independent filesystem and schema
+    # work concurrently off the event loop
     setup_logging()
-    ensure_directories()
-    create_tables()
-    
+    await asyncio.gather(
+        asyncio.to_thread(ensure_directories),
+        asyncio.to_thread(create_tables),
+    )
+    await asyncio.to_thread(warmup_pool)
+
     yield
     
     # Shutdown
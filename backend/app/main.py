@@ -1,7 +1,9 @@
 """Main FastAPI application."""
 
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 from app.api import routes_jobs, routes_overlays, routes_trim, routes_variants, routes_videos
 from app.core.config import settings
@@ -13,7 +15,8 @@ app = FastAPI(
     description="Backend API for video processing with trimming, overlays, and transcoding",
     version="0.1.0",
     lifespan=lifespan,
-    root_path=settings.api_root_path
+    root_path=settings.api_root_path,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -33,7 +36,12 @@ app.include_router(routes_jobs.router)
 app.include_router(routes_variants.router)
 
 
+# Serialized once at import; the health probe fires every few seconds
+# and its body never changes
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "version": "0.1.0"})
+
+
 @app.get("/", summary="Health check")
-async def health_check():
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy", "version": "0.1.0"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
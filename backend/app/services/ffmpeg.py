@@ -1,9 +1,14 @@
 """FFmpeg operations for video processing."""
 
-import json
+import os
+import selectors
 import subprocess
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+
+import orjson
 
 from app.core.config import settings
 from app.core.errors import FFmpegError
@@ -13,7 +18,18 @@ logger = get_logger(__name__)
 
 
 def probe(path: str) -> Dict[str, float]:
-    """Probe video file and return duration and size."""
+    """Probe video file and return duration and size.
+
+    Results are memoized per (path, mtime, size), so re-probing the same
+    unchanged file skips the ~100 ms ffprobe fork+exec.
+    """
+    stat = os.stat(path)
+    return dict(_probe_cached(path, stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=4096)
+def _probe_cached(path: str, mtime_ns: int, size: int) -> Dict[str, float]:
+    """Run ffprobe for a specific version of a file."""
     cmd = [
         settings.ffprobe_bin,
         "-v", "error",
@@ -24,28 +40,170 @@ def probe(path: str) -> Dict[str, float]:
     ]
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-        
+        # orjson parses the bytes directly; no text decode pass
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        data = orjson.loads(result.stdout)
+
         format_info = data.get("format", {})
         duration = float(format_info.get("duration", 0))
         size = int(format_info.get("size", 0))
-        
+
         return {
             "duration_sec": duration,
             "size_bytes": size
         }
-        
+
     except subprocess.CalledProcessError as e:
-        log_ffmpeg_command(logger, cmd, e.stderr)
-        raise FFmpegError(f"FFprobe failed: {e.stderr}")
-    except json.JSONDecodeError as e:
+        stderr = e.stderr.decode("utf-8", errors="replace")
+        log_ffmpeg_command(logger, cmd, stderr)
+        raise FFmpegError(f"FFprobe failed: {stderr}")
+    except orjson.JSONDecodeError as e:
         raise FFmpegError(f"Failed to parse FFprobe output: {e}")
     except Exception as e:
         raise FFmpegError(f"FFprobe error: {e}")
 
 
-def trim(input_path: str, start: float, end: float, output_path: str) -> None:
+def _encoder_works(encoder: str) -> bool:
+    """Trial-encode one synthetic frame to prove the encoder is usable."""
+    try:
+        result = subprocess.run(
+            [
+                settings.ffmpeg_bin, "-hide_banner", "-loglevel", "error",
+                "-f", "lavfi", "-i", "color=c=black:s=64x64:d=0.1",
+                "-frames:v", "1", "-c:v", encoder, "-f", "null", "-",
+            ],
+            capture_output=True, timeout=15,
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=1)
+def _resolve_encoder() -> str:
+    """Pick the H.264 encoder once per process.
+
+    Honors an explicit VIDEO_ENCODER setting; otherwise probes
+    `ffmpeg -encoders` for a hardware encoder and falls back to libx264.
+    Being listed only proves the codec was compiled in — distro builds
+    list h264_nvenc on GPU-less hosts — so each candidate must also pass
+    a one-frame trial encode before it is selected.
+    """
+    if settings.video_encoder != "auto":
+        return settings.video_encoder
+    try:
+        result = subprocess.run(
+            [settings.ffmpeg_bin, "-hide_banner", "-encoders"],
+            capture_output=True, text=True, check=True
+        )
+    except Exception:
+        return "libx264"
+    for candidate in ("h264_nvenc", "h264_videotoolbox"):
+        if candidate in result.stdout and _encoder_works(candidate):
+            return candidate
+    return "libx264"
+
+
+def _encoder_args(crf: int) -> List[str]:
+    """Build video-encoder arguments for the resolved encoder."""
+    encoder = _resolve_encoder()
+    if encoder == "h264_nvenc":
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", str(crf)]
+    if encoder == "h264_videotoolbox":
+        # videotoolbox quality runs 1-100 (higher is better), roughly
+        # inverse of CRF
+        return ["-c:v", "h264_videotoolbox", "-q:v", str(max(1, 100 - 2 * crf))]
+    return ["-c:v", "libx264", "-preset", "veryfast", "-crf", str(crf)]
+
+
+# Keep only the last lines of FFmpeg stderr; the useful error is at the end
+_STDERR_TAIL_LINES = 200
+
+
+def _run_ffmpeg(
+    cmd: List[str],
+    error_prefix: str,
+    duration_sec: Optional[float] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> None:
+    """Run an FFmpeg command without buffering its full output in memory.
+
+    stderr is drained into a bounded tail buffer (a long transcode can
+    log many MB of stats otherwise); only the tail goes into FFmpegError
+    on failure. When on_progress and duration_sec are given, FFmpeg is
+    run with `-progress pipe:1` and out_time updates are reported as a
+    0-100 percentage.
+    """
+    cmd = list(cmd)
+    track_progress = on_progress is not None and duration_sec
+    # Global options go right after the binary
+    cmd[1:1] = ["-progress", "pipe:1", "-nostats"] if track_progress else ["-nostats"]
+
+    tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+    try:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE if track_progress else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        try:
+            selector = selectors.DefaultSelector()
+            selector.register(process.stderr, selectors.EVENT_READ)
+            if track_progress:
+                selector.register(process.stdout, selectors.EVENT_READ)
+            open_streams = len(selector.get_map())
+            progress_buf = b""
+
+            while open_streams:
+                for key, _ in selector.select():
+                    chunk = key.fileobj.read1(65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        open_streams -= 1
+                        continue
+                    if key.fileobj is process.stderr:
+                        tail.extend(chunk.splitlines())
+                    else:
+                        progress_buf += chunk
+                        *lines, progress_buf = progress_buf.split(b"\n")
+                        for line in lines:
+                            # out_time_ms is in microseconds despite its name
+                            if line.startswith(b"out_time_ms="):
+                                try:
+                                    out_us = int(line.split(b"=", 1)[1])
+                                except ValueError:
+                                    continue
+                                percent = int(out_us / (duration_sec * 1e6) * 100)
+                                on_progress(min(max(percent, 0), 99))
+
+            selector.close()
+            returncode = process.wait()
+        finally:
+            # Never orphan the child: if the drain loop dies (e.g. an
+            # on_progress callback raising), ffmpeg would wedge forever
+            # once the un-drained stderr pipe fills
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        stderr_tail = b"\n".join(tail).decode("utf-8", errors="replace")
+        if returncode != 0:
+            log_ffmpeg_command(logger, cmd, stderr_tail)
+            raise FFmpegError(f"{error_prefix} failed: {stderr_tail}")
+        log_ffmpeg_command(logger, cmd)
+
+    except FFmpegError:
+        raise
+    except Exception as e:
+        raise FFmpegError(f"{error_prefix} error: {e}")
+
+
+def trim(
+    input_path: str,
+    start: float,
+    end: float,
+    output_path: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> None:
     """Trim video to specified time range."""
     cmd = [
         settings.ffmpeg_bin,
@@ -53,26 +211,23 @@ def trim(input_path: str, start: float, end: float, output_path: str) -> None:
         "-i", input_path,
         "-ss", str(start),
         "-to", str(end),
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-crf", "18",
+        *_encoder_args(18),
         "-c:a", "aac",
         "-b:a", "128k",
         output_path
     ]
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        log_ffmpeg_command(logger, cmd)
-        
-    except subprocess.CalledProcessError as e:
-        log_ffmpeg_command(logger, cmd, e.stderr)
-        raise FFmpegError(f"Trim failed: {e.stderr}")
-    except Exception as e:
-        raise FFmpegError(f"Trim error: {e}")
 
+    _run_ffmpeg(cmd, "Trim", duration_sec=end - start, on_progress=on_progress)
 
-def overlay(input_path: str, overlays: List[Dict], watermark: Optional[Dict], output_path: str) -> None:
+
+def overlay(
+    input_path: str,
+    overlays: List[Dict],
+    watermark: Optional[Dict],
+    output_path: str,
+    duration_sec: Optional[float] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> None:
     """Apply overlays and watermark to video."""
     from app.services.filters import build_filter_complex
     
@@ -86,76 +241,72 @@ def overlay(input_path: str, overlays: List[Dict], watermark: Optional[Dict], ou
     for extra_input in extra_inputs:
         cmd.extend(["-i", extra_input])
     
-    # Add filter complex
     if filter_complex:
         cmd.extend(["-filter_complex", filter_complex])
         # Ensure we map the final video label explicitly
         cmd.extend(["-map", f"[{final_label}]"])
+        # Map audio and set shortest
+        cmd.extend(["-map", "0:a?", "-shortest"])
+        cmd.extend([
+            *_encoder_args(20),
+            "-c:a", "copy",
+            output_path
+        ])
     else:
-        # No overlays; keep original video
-        cmd.extend(["-map", "0:v"]) 
-    
-    # Map audio and set shortest
-    cmd.extend(["-map", "0:a?", "-shortest"])
-    
-    # Output settings
-    cmd.extend([
-        "-c:v", "libx264",
-        "-crf", "20",
-        "-preset", "veryfast",
-        "-c:a", "copy",
-        output_path
-    ])
-    
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        log_ffmpeg_command(logger, cmd)
-        
-    except subprocess.CalledProcessError as e:
-        log_ffmpeg_command(logger, cmd, e.stderr)
-        raise FFmpegError(f"Overlay failed: {e.stderr}")
-    except Exception as e:
-        raise FFmpegError(f"Overlay error: {e}")
+        # Nothing to draw: remux with stream copy instead of paying a
+        # full decode + re-encode for identical output
+        cmd.extend(["-map", "0:v", "-map", "0:a?", "-c", "copy", output_path])
 
+    _run_ffmpeg(cmd, "Overlay", duration_sec=duration_sec, on_progress=on_progress)
 
-def transcode_multi(input_path: str, heights: List[int] = [1080, 720, 480]) -> Dict[int, str]:
-    """Transcode video to multiple quality levels."""
-    from pathlib import Path
-    
+
+def transcode_multi(
+    input_path: str,
+    heights: List[int] = [1080, 720, 480],
+    duration_sec: Optional[float] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Dict[int, str]:
+    """Transcode video to multiple quality levels in one FFmpeg pass.
+
+    The source is decoded once and split to one scale+encode branch per
+    height, instead of re-decoding the whole input for every quality.
+    """
     input_file = Path(input_path)
     base_name = input_file.stem
     # Write transcode outputs to variants directory
     output_dir = settings.processed_dir
     output_dir.mkdir(parents=True, exist_ok=True)
-    
+
     results = {}
     crf_map = {1080: 20, 720: 22, 480: 24}
-    
-    for height in heights:
+
+    # [0:v]split=N[v1]..[vN];[v1]scale=-2:1080[o1];...
+    split_outputs = "".join(f"[v{i}]" for i in range(1, len(heights) + 1))
+    filter_parts = [f"[0:v]split={len(heights)}{split_outputs}"]
+    for i, height in enumerate(heights, start=1):
+        filter_parts.append(f"[v{i}]scale=-2:{height}[o{i}]")
+    filter_complex = ";".join(filter_parts)
+
+    cmd = [
+        settings.ffmpeg_bin,
+        "-y",
+        "-i", input_path,
+        "-filter_complex", filter_complex,
+    ]
+    for i, height in enumerate(heights, start=1):
         output_path = output_dir / f"{base_name}_{height}p.mp4"
-        
-        cmd = [
-            settings.ffmpeg_bin,
-            "-y",
-            "-i", input_path,
-            "-vf", f"scale=-2:{height}",
-            "-c:v", "libx264",
-            "-crf", str(crf_map.get(height, 24)),
-            "-preset", "veryfast",
+        cmd.extend([
+            "-map", f"[o{i}]",
+            *_encoder_args(crf_map.get(height, 24)),
+            "-map", "0:a?",
             "-c:a", "aac",
             "-b:a", "128k",
             str(output_path)
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            log_ffmpeg_command(logger, cmd)
-            results[height] = str(output_path)
-            
-        except subprocess.CalledProcessError as e:
-            log_ffmpeg_command(logger, cmd, e.stderr)
-            raise FFmpegError(f"Transcode {height}p failed: {e.stderr}")
-        except Exception as e:
-            raise FFmpegError(f"Transcode {height}p error: {e}")
-    
+        ])
+        results[height] = str(output_path)
+
+    _run_ffmpeg(
+        cmd, f"Transcode {heights}", duration_sec=duration_sec, on_progress=on_progress
+    )
+
     return results
@@ -1,7 +1,44 @@
 """Filter complex builder for FFmpeg overlays."""
 
+import re
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
+# Position-expression fixups in two sequential compiled-regex passes,
+# matching the old chained-replace composition: w_i/h_i typos collapse
+# to the overlay dims first, then lowercase main dims in subtraction
+# expressions — including ones the first pass just produced — are
+# uppercased (so "(w_i-10)" becomes "(W-10)", not "(w-10)").
+_POS_TYPO_PATTERN = re.compile(r"([wh])_i")
+_POS_MAIN_PATTERN = re.compile(r"\(([wh])-")
+_CENTER_ALIASES = frozenset({"center", "centre", "middle"})
+
+
+@lru_cache(maxsize=512)
+def _fix_pos_expr(s: str) -> str:
+    """Apply both fixup passes to a position expression, memoized."""
+    s = _POS_TYPO_PATTERN.sub(lambda m: m.group(1), s)
+    return _POS_MAIN_PATTERN.sub(lambda m: f"({m.group(1).upper()}-", s)
+
+
+def _norm_pos(v, axis: str):
+    """Normalize common position shorthands/expressions."""
+    if isinstance(v, (int, float)):
+        return v
+    if isinstance(v, str):
+        s = v.strip()
+        if s.lower() in _CENTER_ALIASES:
+            return "(W-w)/2" if axis == "x" else "(H-h)/2"
+        return _fix_pos_expr(s)
+    return v
+
+
+def _freeze(spec: Optional[Dict]) -> Optional[Tuple]:
+    """Flatten an overlay dict into a hashable tuple of sorted items."""
+    if spec is None:
+        return None
+    return tuple(sorted(spec.items()))
+
 
 def build_filter_complex(overlays: List[Dict], watermark: Optional[Dict]) -> Tuple[str, List[str], str]:
     """Build FFmpeg filter_complex string for overlays and watermark.
@@ -9,7 +46,24 @@ def build_filter_complex(overlays: List[Dict], watermark: Optional[Dict]) -> Tup
     We build a linear chain starting from [0:v] and each step writes to a new
     labeled stream [vN]. Additional inputs (images/videos) are appended to the
     input list and referenced by their input index.
+
+    The rendering itself is memoized on the frozen overlay specs, so a
+    standard watermark/overlay template reused across requests is only
+    string-built once.
     """
+    frozen = tuple(_freeze(overlay) for overlay in overlays)
+    filter_complex, extra_inputs, final_label = _render_filter(frozen, _freeze(watermark))
+    return filter_complex, list(extra_inputs), final_label
+
+
+@lru_cache(maxsize=512)
+def _render_filter(
+    frozen_overlays: Tuple[Optional[Tuple], ...], frozen_watermark: Optional[Tuple]
+) -> Tuple[str, Tuple[str, ...], str]:
+    """Render the filter chain for a frozen set of overlay specs."""
+    overlays = [dict(items) for items in frozen_overlays]
+    watermark = dict(frozen_watermark) if frozen_watermark is not None else None
+
     filters: List[str] = []
     extra_inputs: List[str] = []
 
@@ -52,7 +106,7 @@ def build_filter_complex(overlays: List[Dict], watermark: Optional[Dict]) -> Tup
         current_label = out_label
 
     filter_complex = ";".join(filters)
-    return filter_complex, extra_inputs, current_label
+    return filter_complex, tuple(extra_inputs), current_label
 
 
 def _text_filter(in_label: str, overlay: Dict, out_label: str) -> str:
@@ -65,7 +119,7 @@ def _text_filter(in_label: str, overlay: Dict, out_label: str) -> str:
     y = overlay.get("y", 20)
     start = overlay.get("start", 0)
     end = overlay.get("end")
-    
+
     # Build filter string
     filter_parts = [
         f"drawtext=text='{text}'",
@@ -82,29 +136,12 @@ def _text_filter(in_label: str, overlay: Dict, out_label: str) -> str:
 
 def _image_filter(in_label: str, input_index: int, overlay: Dict, out_label: str) -> str:
     """Build overlay filter for image overlay."""
-    x = overlay.get("x", 20)
-    y = overlay.get("y", 20)
+    x = _norm_pos(overlay.get("x", 20), "x")
+    y = _norm_pos(overlay.get("y", 20), "y")
     start = overlay.get("start", 0)
     end = overlay.get("end")
     opacity = overlay.get("opacity")
-    
-    # Normalize common position shorthands/expressions
-    def norm_pos(v, axis: str):
-        if isinstance(v, (int, float)):
-            return v
-        if isinstance(v, str):
-            s = v.strip()
-            if s.lower() in {"center", "centre", "middle"}:
-                return "(W-w)/2" if axis == "x" else "(H-h)/2"
-            # Fix common typos like w_i/h_i coming from prior examples
-            s = s.replace("w_i", "w").replace("h_i", "h")
-            # If expression subtracts overlay from main using lowercase main dims, uppercase them
-            s = s.replace("(w-", "(W-").replace("(h-", "(H-")
-            return s
-        return v
-    x = norm_pos(x, "x")
-    y = norm_pos(y, "y")
-    
+
     # Build filter string
     enable = f"enable='between(t,{start},{end or '1e9'})'"
     if opacity is not None:
@@ -118,27 +155,12 @@ def _image_filter(in_label: str, input_index: int, overlay: Dict, out_label: str
 
 def _video_filter(in_label: str, input_index: int, overlay: Dict, out_label: str) -> str:
     """Build overlay filter for video overlay."""
-    x = overlay.get("x", 20)
-    y = overlay.get("y", 20)
+    x = _norm_pos(overlay.get("x", 20), "x")
+    y = _norm_pos(overlay.get("y", 20), "y")
     start = overlay.get("start", 0)
     end = overlay.get("end")
     scale = overlay.get("scale", 1.0)
-    
-    # Normalize positions as in _image_filter
-    def norm_pos(v, axis: str):
-        if isinstance(v, (int, float)):
-            return v
-        if isinstance(v, str):
-            s = v.strip()
-            if s.lower() in {"center", "centre", "middle"}:
-                return "(W-w)/2" if axis == "x" else "(H-h)/2"
-            s = s.replace("w_i", "w").replace("h_i", "h")
-            s = s.replace("(w-", "(W-").replace("(h-", "(H-")
-            return s
-        return v
-    x = norm_pos(x, "x")
-    y = norm_pos(y, "y")
-    
+
     enable = f"enable='between(t,{start},{end or '1e9'})'"
     if scale != 1.0:
         return (
@@ -153,7 +175,7 @@ def _watermark_filter(in_label: str, input_index: int, watermark: Dict, out_labe
     x = watermark.get("x", "W-w-20")
     y = watermark.get("y", "H-h-20")
     opacity = watermark.get("opacity", 0.5)
-    
+
     return (
         f"[{input_index}]format=rgba,colorchannelmixer=aa={opacity}[wm{input_index}];"
         f"[{in_label}][wm{input_index}]overlay={x}:{y}:enable='between(t,0,1e9)'[{out_label}]"
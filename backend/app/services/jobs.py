@@ -1,13 +1,14 @@
 """Background job management system."""
 
+import os
 from pathlib import Path
-import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Dict, Optional
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from app.db.base import SessionLocal
+from app.db.base import WorkerSession
 
 from app.core.config import settings
 from app.core.errors import JobError
@@ -22,18 +23,41 @@ from app.utils.timecodes import parse_timecode, validate_time_range
 logger = get_logger(__name__)
 
 
+# Coalesce progress pings: skip DB writes for changes smaller than this
+# unless this much time has passed since the last write
+_PROGRESS_MIN_DELTA = 5
+_PROGRESS_MIN_INTERVAL = 2.0
+
+
 class JobContext:
     """Context for job execution with progress reporting."""
-    
+
     def __init__(self, job_id: UUID, db: Session):
         self.job_id = job_id
         self.db = db
         self._output_variant_id: Optional[UUID] = None
-    
+        self._last_progress = -1
+        self._last_flush = 0.0
+
     def report_progress(self, progress: int) -> None:
-        """Report job progress."""
+        """Report job progress, coalescing chatty updates.
+
+        FFmpeg can emit progress many times per second; writing each
+        ping would mean hundreds of commits per long job. Small, recent
+        changes stay in memory and only meaningful jumps (or a stale
+        bar) hit the database.
+        """
         log_job_progress(logger, str(self.job_id), progress)
-        JobCRUD.update_status(self.db, self.job_id, JobStatus.STARTED, progress)
+        now = time.monotonic()
+        if (
+            0 < progress < 100  # terminal values always reach the DB
+            and progress - self._last_progress < _PROGRESS_MIN_DELTA
+            and now - self._last_flush < _PROGRESS_MIN_INTERVAL
+        ):
+            return
+        self._last_progress = progress
+        self._last_flush = now
+        JobCRUD.update_progress(self.db, self.job_id, progress)
     
     def set_output_variant(self, variant_id: UUID) -> None:
         """Set the output variant ID."""
@@ -56,27 +80,32 @@ class JobManager:
     """Manages background job execution."""
     
     def __init__(self):
+        # Job state lives in the jobs table; no tracker dict (or lock
+        # around it) is needed beyond the executor's own queue
         self.executor = ThreadPoolExecutor(max_workers=2)
-        self.futures: Dict[UUID, threading.Future] = {}
-        self._lock = threading.Lock()
-    
+
     def submit(self, job_type: JobType, payload: Dict, handler: Callable, db: Session) -> UUID:
         """Submit a new job for execution."""
         # Create job record
         job = JobCRUD.create(db, job_type, payload.get("video_id"), payload.get("input_variant_id"))
-        
+
         # Submit to executor
-        future = self.executor.submit(self._execute_job, job.id, job_type, payload, handler, db)
-        
-        with self._lock:
-            self.futures[job.id] = future
-        
+        self.executor.submit(self._execute_job, job.id, job_type, payload, handler)
+
         return job.id
-    
-    def _execute_job(self, job_id: UUID, job_type: JobType, payload: Dict, handler: Callable, db: Session) -> None:
+
+    def submit_existing(self, job_id: UUID, job_type: JobType, payload: Dict, handler: Callable) -> UUID:
+        """Schedule execution for a job row that was already created."""
+        self.executor.submit(self._execute_job, job_id, job_type, payload, handler)
+
+        return job_id
+
+    def _execute_job(self, job_id: UUID, job_type: JobType, payload: Dict, handler: Callable) -> None:
         """Execute a job with proper error handling."""
-        # Use a fresh DB session per background thread (request session is not thread-safe)
-        thread_db: Session = SessionLocal()
+        # Thread-scoped session: reused across jobs on the same worker
+        # thread, so repeat jobs skip session setup (request sessions are
+        # never shared into this thread)
+        thread_db: Session = WorkerSession()
         try:
             JobCRUD.update_status(thread_db, job_id, JobStatus.STARTED, 0)
 
@@ -90,9 +119,9 @@ class JobManager:
             JobCRUD.update_status(thread_db, job_id, JobStatus.FAILURE, error_message=str(e))
             log_job_progress(logger, str(job_id), 0, f"Failed: {e}")
         finally:
-            thread_db.close()
-            with self._lock:
-                self.futures.pop(job_id, None)
+            # Reset transactional state but keep the warm session for the
+            # next job on this thread
+            thread_db.rollback()
     
     def shutdown(self) -> None:
         """Shutdown the job manager."""
@@ -143,8 +172,11 @@ def handle_trim(ctx: JobContext, payload: Dict) -> None:
     temp_path, final_path = make_temp_and_final("variants", ".mp4")
     
     try:
-        # Trim video
-        trim(input_path, start_sec, end_sec, str(temp_path))
+        # Trim video, mapping FFmpeg progress onto the 30-70 band
+        trim(
+            input_path, start_sec, end_sec, str(temp_path),
+            on_progress=lambda p: ctx.report_progress(30 + p * 40 // 100),
+        )
         ctx.report_progress(70)
         
         # Commit file
@@ -194,30 +226,37 @@ def handle_overlay(ctx: JobContext, payload: Dict) -> None:
         if not source_variant:
             ctx.fail("Source variant not found")
         input_path = source_variant.stored_path
+        duration = float(source_variant.duration_sec)
     else:
         video = VideoCRUD.get_by_id(ctx.db, video_id)
         if not video:
             ctx.fail("Video not found")
         input_path = video.stored_path
-    
+        duration = float(video.duration_sec or 0)
+
     ctx.report_progress(20)
-    
+
     # Create output paths
     temp_path, final_path = make_temp_and_final("variants", ".mp4")
-    
+
     try:
-        # Apply overlays
-        overlay(input_path, overlays, watermark, str(temp_path))
+        # Apply overlays, mapping FFmpeg progress onto the 20-70 band
+        overlay(
+            input_path, overlays, watermark, str(temp_path),
+            duration_sec=duration or None,
+            on_progress=lambda p: ctx.report_progress(20 + p * 50 // 100),
+        )
         ctx.report_progress(70)
         
         # Commit file
         commit_temp(temp_path, final_path)
         ctx.report_progress(80)
         
-        # Get file info
+        # Get file info; overlays don't change duration, so reuse the
+        # source duration instead of re-probing the output
         size_bytes = final_path.stat().st_size
-        video_info = probe(str(final_path))
-        
+        duration_out = duration or probe(str(final_path))["duration_sec"]
+
         # Choose variant kind
         variant_kind = VariantKind.WATERMARK if (not overlays and watermark) else VariantKind.OVERLAY
 
@@ -229,20 +268,13 @@ def handle_overlay(ctx: JobContext, payload: Dict) -> None:
             quality=VariantQuality.SOURCE,
             stored_path=str(final_path),
             size_bytes=size_bytes,
-            duration_sec=video_info["duration_sec"],
+            duration_sec=duration_out,
             source_variant_id=source_variant_id,
             config_json={"overlays": overlays, "watermark": watermark}
         )
         
-        # Create overlay records
-        for overlay_spec in overlays:
-            OverlayCRUD.create(
-                ctx.db,
-                video_id=video_id,
-                variant_id=variant.id,
-                overlay_type=overlay_spec["type"],
-                payload_json=overlay_spec
-            )
+        # Create overlay records in one batched INSERT
+        OverlayCRUD.create_many(ctx.db, video_id, variant.id, overlays)
         
         ctx.set_output_variant(variant.id)
         ctx.report_progress(100)
@@ -254,49 +286,74 @@ def handle_overlay(ctx: JobContext, payload: Dict) -> None:
         raise
 
 
+# Quality labels are validated against these at the API layer
+# (TranscodeIn's Literal types), so the worker maps them directly
+_QUALITY_HEIGHTS = {"1080p": 1080, "720p": 720, "480p": 480}
+_DEFAULT_QUALITIES = ("1080p", "720p", "480p")
+
+
 def handle_transcode_multi(ctx: JobContext, payload: Dict) -> None:
     """Handle multi-quality transcoding job."""
     from app.db.crud import VideoCRUD, VideoVariantCRUD
-    
+
     video_id = payload["video_id"]
-    qualities = payload.get("qualities", ["1080p", "720p", "480p"])
-    
+    qualities = payload.get("qualities")
+    if qualities is None:
+        qualities = _DEFAULT_QUALITIES
+    elif not qualities:
+        # An explicit empty list is a no-op job, not a request for the
+        # defaults (and would build an invalid split=0 filter downstream)
+        ctx.report_progress(100)
+        return
+
     ctx.report_progress(10)
-    
+
     # Get video
     video = VideoCRUD.get_by_id(ctx.db, video_id)
     if not video:
         ctx.fail("Video not found")
-    
+
     input_path = video.stored_path
     ctx.report_progress(20)
-    
-    # Map quality strings to heights
-    quality_map = {"1080p": 1080, "720p": 720, "480p": 480}
-    heights = [quality_map[q] for q in qualities if q in quality_map]
-    
+
+    heights = [_QUALITY_HEIGHTS[q] for q in qualities]
+
+    # Bound before the try so cleanup still runs when transcode_multi
+    # itself raises (partial outputs are the common failure mode of the
+    # single-pass command)
+    results = {}
     try:
-        # Transcode to multiple qualities
-        results = transcode_multi(input_path, heights)
+        # Transcode to multiple qualities, mapping FFmpeg progress onto
+        # the 20-80 band
+        results = transcode_multi(
+            input_path, heights,
+            duration_sec=float(video.duration_sec or 0) or None,
+            on_progress=lambda p: ctx.report_progress(20 + p * 60 // 100),
+        )
         ctx.report_progress(80)
-        
-        # Create variant records
+
+        # Transcoding preserves duration: take it from the video row
+        # (probing once as a fallback) rather than probing every output
+        duration = float(video.duration_sec or 0) or probe(input_path)["duration_sec"]
+
+        # Collect variant rows and insert them in one commit; only a
+        # stat per output remains here, so no parallelism is warranted
+        variant_rows = []
         for height, output_path in results.items():
-            size_bytes = Path(output_path).stat().st_size
-            video_info = probe(output_path)
-            
+            size_bytes = os.stat(output_path).st_size
+
             quality_str = f"{height}p"
-            VideoVariantCRUD.create(
-                ctx.db,
-                video_id=video_id,
-                kind=VariantKind.TRANSCODE,
-                quality=quality_str,
-                stored_path=output_path,
-                size_bytes=size_bytes,
-                duration_sec=video_info["duration_sec"],
-                config_json={"quality": quality_str}
-            )
-        
+            variant_rows.append({
+                "video_id": video_id,
+                "kind": VariantKind.TRANSCODE,
+                "quality": quality_str,
+                "stored_path": output_path,
+                "size_bytes": size_bytes,
+                "duration_sec": duration,
+                "config_json": {"quality": quality_str},
+            })
+        VideoVariantCRUD.copy_insert(ctx.db, variant_rows)
+
         ctx.report_progress(100)
         
     except Exception as e:
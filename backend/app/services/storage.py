@@ -1,16 +1,18 @@
 """File storage and streaming utilities."""
 
+import mimetypes
 import os
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from fastapi import UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse
 
 from app.core.config import settings
 from app.core.errors import StorageError, SecurityError
-from app.utils.ids import generate_final_filename, generate_temp_filename, get_file_extension
+from app.utils.ids import generate_final_filename, get_file_extension
 
 
 class StoredFile:
@@ -22,65 +24,136 @@ class StoredFile:
         self.mime_type = mime_type
 
 
+# Storage roots never change after import, so bind them once; hot paths
+# do plain name lookups instead of going through the settings object
+_UPLOADS_DIR = settings.uploads_dir
+_PROCESSED_DIR = settings.processed_dir
+_VARIANTS_DIR = settings.variants_dir
+
+_CATEGORY_DIRS = {
+    "processed": _PROCESSED_DIR,
+    "variants": _VARIANTS_DIR,
+}
+
+
+# Directories are created once (at startup); later calls skip the mkdir
+# syscalls on the hot upload path
+_dirs_ready = False
+
+
 def ensure_directories() -> None:
-    """Ensure all required directories exist."""
-    directories = [
-        settings.uploads_dir,
-        settings.processed_dir,
-        settings.variants_dir,
-    ]
-    
-    for directory in directories:
+    """Ensure all required directories exist; no-op after first success."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+
+    for directory in (_UPLOADS_DIR, _PROCESSED_DIR, _VARIANTS_DIR):
         directory.mkdir(parents=True, exist_ok=True)
 
+    _dirs_ready = True
 
-def validate_asset_path(path: str) -> bool:
-    """Validate that asset path is within allowed directories."""
+
+@lru_cache(maxsize=1)
+def _allowed_roots() -> tuple[Path, Path]:
+    """Resolve the allowed asset roots once; they never change at runtime."""
+    return settings.assets_dir.resolve(), settings.media_root.resolve()
+
+
+@lru_cache(maxsize=4096)
+def _validated(path: str) -> bool:
+    """Resolve and check an asset path against the allowed directories."""
     try:
         asset_path = Path(path).resolve()
-        assets_dir = settings.assets_dir.resolve()
-        data_dir = settings.media_root.resolve()
-        
-        # Check if path is within assets or data directories
-        return (str(asset_path).startswith(str(assets_dir)) or 
-                str(asset_path).startswith(str(data_dir)))
+        assets_dir, data_dir = _allowed_roots()
+
+        # is_relative_to compares path components, so /data-evil doesn't
+        # pass as a prefix of /data the way startswith would allow
+        return (asset_path.is_relative_to(assets_dir) or
+                asset_path.is_relative_to(data_dir))
     except (OSError, ValueError):
         return False
 
 
+def validate_asset_path(path: str) -> bool:
+    """Validate that asset path is within allowed directories.
+
+    Results are memoized per path string so requests referencing the same
+    asset library skip the resolve() syscalls after the first check.
+    """
+    return _validated(path)
+
+
+def clear_asset_cache() -> None:
+    """Drop memoized asset-path checks after asset-directory mutations."""
+    _validated.cache_clear()
+
+
+# 1 MiB copy buffer: fewer syscalls than the 64 KiB stdlib default
+_COPY_BUFFER_SIZE = 1 << 20
+
+
+def _copy_to_disk(src, dst) -> None:
+    """Copy an upload stream to an open destination file.
+
+    Large uploads are spooled to a real file by Starlette; for those,
+    os.sendfile moves the bytes kernel-side with zero user-space copies.
+    In-memory spools fall back to copyfileobj with a large buffer.
+    """
+    if hasattr(os, "sendfile") and getattr(src, "_rolled", False):
+        src_fd = src.fileno()
+        size = os.fstat(src_fd).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+        return
+    shutil.copyfileobj(src, dst, length=_COPY_BUFFER_SIZE)
+
+
 def save_upload(file: UploadFile) -> StoredFile:
-    """Save uploaded file to storage."""
+    """Save uploaded file to storage.
+
+    The server-generated UUID name can't collide, so the upload streams
+    straight to its final path — no temp file and no rename. A failed
+    copy deletes the partial file before the row referencing it would
+    ever be created.
+    """
     ensure_directories()
-    
+
     # Generate safe filename
     extension = get_file_extension(file.filename or "")
-    temp_filename = generate_temp_filename(extension)
-    final_filename = generate_final_filename(extension)
-    
-    temp_path = settings.uploads_dir / temp_filename
-    final_path = settings.uploads_dir / final_filename
-    
+    final_path = _UPLOADS_DIR / generate_final_filename(extension)
+
     try:
-        # Save to temporary file first
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Get file size
-        size_bytes = temp_path.stat().st_size
-        
-        # Atomic rename
-        temp_path.rename(final_path)
-        
+        # Buffered writer: BufferedWriter retries short writes, which a
+        # raw unbuffered file is allowed to drop (signal, near-full
+        # disk); the 1 MiB copy chunks keep syscall count low anyway
+        with open(final_path, "wb") as buffer:
+            # Preallocate when the size is known: contiguous extents
+            # keep multi-GB writes sequential on disk
+            size_hint = getattr(file, "size", None)
+            preallocated = bool(size_hint) and hasattr(os, "posix_fallocate")
+            if preallocated:
+                os.posix_fallocate(buffer.fileno(), 0, size_hint)
+            _copy_to_disk(file.file, buffer)
+            if preallocated:
+                buffer.flush()
+                os.ftruncate(buffer.fileno(), buffer.tell())
+
+        size_bytes = final_path.stat().st_size
+
         return StoredFile(
             path=str(final_path),
             size_bytes=size_bytes,
             mime_type=file.content_type or "application/octet-stream"
         )
-        
+
     except Exception as e:
-        # Clean up temp file if it exists
-        if temp_path.exists():
-            temp_path.unlink()
+        # Clean up the partial file if it exists
+        if final_path.exists():
+            final_path.unlink()
         raise StorageError(f"Failed to save upload: {str(e)}")
 
 
@@ -88,46 +161,55 @@ def make_temp_and_final(category: str, extension: str) -> tuple[Path, Path]:
     """Create temporary and final file paths for processing."""
     ensure_directories()
     
-    if category == "processed":
-        base_dir = settings.processed_dir
-    elif category == "variants":
-        base_dir = settings.variants_dir
-    else:
+    try:
+        base_dir = _CATEGORY_DIRS[category]
+    except KeyError:
         raise ValueError(f"Invalid category: {category}")
     
-    temp_filename = generate_temp_filename(extension)
     final_filename = generate_final_filename(extension)
-    
-    temp_path = base_dir / temp_filename
+
+    # Same-directory in-flight sibling: the commit rename is a single
+    # directory-entry update and only one name is generated per output.
+    # The .part sentinel goes before the media extension so FFmpeg can
+    # still guess the output muxer from the temp name.
+    stem = final_filename[:-len(extension)] if extension else final_filename
+    temp_path = base_dir / f"{stem}.part{extension}"
     final_path = base_dir / final_filename
-    
+
     return temp_path, final_path
 
 
 def commit_temp(temp_path: Path, final_path: Path) -> None:
     """Atomically rename temporary file to final path."""
     try:
-        temp_path.rename(final_path)
+        os.replace(temp_path, final_path)
     except Exception as e:
         raise StorageError(f"Failed to commit temporary file: {str(e)}")
 
 
-def open_stream(path: str) -> StreamingResponse:
-    """Open file for streaming response."""
+def open_stream(path: str) -> FileResponse:
+    """Serve a stored file as a download response.
+
+    FileResponse lets the ASGI server send the file via sendfile() (no
+    user-space copies), sets Content-Length/ETag/Last-Modified, and
+    honors Range requests for mid-video seeks.
+    """
     file_path = Path(path)
-    
-    if not file_path.exists():
+
+    # One stat serves both the existence check and FileResponse's
+    # Content-Length/Last-Modified headers
+    try:
+        stat_result = os.stat(path)
+    except OSError:
         raise StorageError(f"File not found: {path}")
-    
-    def iter_file():
-        with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                yield chunk
-    
-    return StreamingResponse(
-        iter_file(),
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={file_path.name}"}
+
+    media_type = mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+    return FileResponse(
+        file_path,
+        media_type=media_type,
+        filename=file_path.name,
+        stat_result=stat_result,
+        headers={"Accept-Ranges": "bytes"},
     )
 
 
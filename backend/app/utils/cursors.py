@@ -0,0 +1,22 @@
+"""Opaque cursor encoding for keyset pagination."""
+
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode a (timestamp, id) pair as an opaque base64 cursor."""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode an opaque cursor back into a (timestamp, id) pair."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts_part, id_part = raw.split("|", 1)
+        return datetime.fromisoformat(ts_part), UUID(id_part)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
@@ -1,14 +1,30 @@
 """Utility functions for ID generation and filename handling."""
 
+import os
 import re
+import time
 import uuid
 from pathlib import Path
 from typing import Optional
 
 
 def generate_uuid() -> str:
-    """Generate a new UUID string."""
-    return str(uuid.uuid4())
+    """Generate a new UUID hex string (no dashes)."""
+    return uuid.uuid4().hex
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a UUIDv7 (RFC 9562): 48-bit ms timestamp, then random.
+
+    Time-ordered ids append to the rightmost BTREE leaf instead of
+    landing in random pages, so primary-key inserts stay cache-friendly
+    as tables grow.
+    """
+    ts_ms = time.time_ns() // 1_000_000
+    rand_a = int.from_bytes(os.urandom(2), "big") & 0x0FFF
+    rand_b = int.from_bytes(os.urandom(8), "big") & 0x3FFFFFFFFFFFFFFF
+    value = (ts_ms << 80) | (0x7 << 76) | (rand_a << 64) | (0x2 << 62) | rand_b
+    return uuid.UUID(int=value)
 
 
 def safe_filename(filename: str) -> str:
@@ -28,17 +44,16 @@ def get_file_extension(filename: str) -> str:
     return Path(filename).suffix.lower()
 
 
-def is_video_file(filename: str) -> bool:
-    """Check if file is a supported video format."""
-    video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv', '.m4v'}
-    return get_file_extension(filename) in video_extensions
+# Supported video extensions, precomputed at import (no leading dot)
+_VIDEO_EXTS = frozenset({'mp4', 'avi', 'mov', 'mkv', 'webm', 'flv', 'wmv', 'm4v'})
 
 
-def generate_temp_filename(extension: str) -> str:
-    """Generate a temporary filename with extension."""
-    return f"{generate_uuid()}.tmp{extension}"
+def is_video_file(filename: str) -> bool:
+    """Check if file is a supported video format."""
+    dot = filename.rfind('.')
+    return dot >= 0 and filename[dot + 1:].lower() in _VIDEO_EXTS
 
 
 def generate_final_filename(extension: str) -> str:
     """Generate a final filename with extension."""
-    return f"{generate_uuid()}{extension}"
+    return f"{uuid.uuid4().hex}{extension}"
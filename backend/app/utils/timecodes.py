@@ -3,31 +3,32 @@
 import re
 from typing import Union
 
+# Compiled once at import; parse_timecode runs twice per trim request
+_TIMECODE_PATTERN = re.compile(r'^(\d{1,2}):(\d{2}):(\d{2}(?:\.\d+)?)$')
+
 
 def parse_timecode(time_input: Union[float, str]) -> float:
     """Parse timecode from string (HH:MM:SS.sss) or float to seconds."""
     if isinstance(time_input, (int, float)):
         return float(time_input)
-    
+
     if isinstance(time_input, str):
+        # Plain float strings skip the regex entirely
+        if ':' not in time_input:
+            try:
+                return float(time_input)
+            except ValueError:
+                raise ValueError(f"Invalid timecode format: {time_input}")
+
         # Handle HH:MM:SS.sss format
-        timecode_pattern = r'^(\d{1,2}):(\d{2}):(\d{2}(?:\.\d+)?)$'
-        match = re.match(timecode_pattern, time_input)
-        
+        match = _TIMECODE_PATTERN.match(time_input)
+
         if match:
-            hours = int(match.group(1))
-            minutes = int(match.group(2))
-            seconds = float(match.group(3))
-            
-            total_seconds = hours * 3600 + minutes * 60 + seconds
-            return total_seconds
-        
-        # Try to parse as float string
-        try:
-            return float(time_input)
-        except ValueError:
-            raise ValueError(f"Invalid timecode format: {time_input}")
-    
+            hours, minutes, seconds = match.group(1, 2, 3)
+            return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+        raise ValueError(f"Invalid timecode format: {time_input}")
+
     raise ValueError(f"Invalid timecode type: {type(time_input)}")
 
 
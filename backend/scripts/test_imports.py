@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
 """Test script to verify all imports work correctly."""
 
+import sys
+from pathlib import Path
+
+# The script lives under scripts/; put the backend root on sys.path so
+# the app package imports the same way it did from the old location
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
 def test_imports():
     """Test all the imports used in the project."""
     try:
@@ -4,6 +4,11 @@
 import sys
 from pathlib import Path
 
+# The script lives under scripts/; put the backend root on sys.path so
+# the app package imports the same way it did from the old location
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
 def test_imports():
     """Test that all modules can be imported."""
     try: